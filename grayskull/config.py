@@ -39,6 +39,7 @@ class Configuration:
     pkg_need_cxx_compiler: Tuple = field(default_factory=lambda: ("pybind11",))
     url_pypi_metadata: str = "https://pypi.org/pypi/{pkg_name}/json"
     download: bool = False
+    pypi_metadata_only: bool = False
     is_arch: bool = False
     repo_github: Optional[str] = None
     from_local_sdist: bool = False
@@ -116,6 +116,16 @@ def init_parser():
         nargs="+",
         help="List of maintainers which will be added to the recipe.",
     )
+    pypi_parser.add_argument(
+        "--metadata-only",
+        dest="pypi_metadata_only",
+        action="store_true",
+        default=False,
+        help="Build the recipe only from the PyPI JSON metadata, skipping the"
+        " sdist download when the JSON already carries the requirements."
+        " Faster, but entry points, compilers and the license file cannot"
+        " be detected this way.",
+    )
     parser.add_argument(
         "--version",
         "-v",
@@ -301,6 +311,7 @@ def generate_recipes_from_list(list_pkgs, args):
                 pkg_name,
                 is_strict_cf=args.is_strict_conda_forge,
                 download=args.download,
+                pypi_metadata_only=args.pypi_metadata_only,
                 url_pypi_metadata=args.url_pypi_metadata,
                 sections_populate=args.sections_populate,
                 from_local_sdist=from_local_sdist,
@@ -1,13 +1,25 @@
+import configparser
+import hashlib
+import json
 import logging
 import os
 import re
 import shutil
+import subprocess
 import sys
+import tarfile
+import zipfile
+from bisect import bisect_right
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from copy import deepcopy
+from dataclasses import dataclass, field
 from distutils import core
+from email.parser import BytesParser
+from functools import lru_cache, wraps
 from glob import glob
+from itertools import chain
 from pathlib import Path
 from subprocess import check_output
 from tempfile import mkdtemp
@@ -17,14 +29,30 @@ from urllib.parse import urlparse
 import requests
 import tomli
 from colorama import Fore, Style
-from packaging.specifiers import SpecifierSet
 from packaging.utils import canonicalize_version
 from packaging.version import Version
 from pkginfo import UnpackedSDist
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+from grayskull.cli import CLIConfig
 from grayskull.cli.stdout import manage_progressbar, print_msg
 from grayskull.config import Configuration
-from grayskull.license.discovery import ShortLicense, search_license_file
+from grayskull.license.discovery import (
+    ShortLicense,
+    search_license_file,
+    search_license_folder,
+)
 from grayskull.strategy.py_toml import get_all_toml_info
 from grayskull.utils import (
     RE_PEP725_PURL,
@@ -38,47 +66,200 @@ from grayskull.utils import (
 
 log = logging.getLogger(__name__)
 RE_DEPS_NAME = re.compile(r"^\s*([\.a-zA-Z0-9_-]+)", re.MULTILINE)
+RE_PY_SELECTOR = re.compile(
+    r"#\s+\[py\s*(?:([<>=!]+))?\s*(\d+)\]\s*$", re.DOTALL | re.MULTILINE
+)
+RE_EXTRA_REQUIRES_DIST = re.compile(
+    r"(?:(\())?\s*([\.a-zA-Z0-9-_]+)\s*([=!<>]+)\s*[\'\"]*"
+    r"([\.a-zA-Z0-9-_]+)[\'\"]*\s*(?:(\)))?\s*(?:(and|or))?"
+)
+RE_PKG_NAME_VERSION = re.compile(r"^\s*([^\s]+)\s*([\(]*.*[\)]*)?\s*", re.DOTALL)
+RE_PARENTHESES = re.compile(r"[\(\)]")
+RE_REQUIRES_PYTHON = re.compile(r"([~><=!]+)\s*(\d+)(?:\.(\d+))?")
+RE_NON_ALPHABETIC = re.compile(r"[^a-zA-Z]+")
+RE_SPLIT_CONSTRAIN = re.compile(r"([><!=~^]+)")
+RE_EXTRA_MARKER = re.compile(r"""extra\s*==\s*['"]([^'"]+)['"]""")
+RE_MARKER_AND = re.compile(r"\s+and\s+")
+RE_REQUIRES_DIST = re.compile(
+    r"^\s*(?P<name>[^\s;]+)\s*(?P<version>[^;]*)(?:;(?P<markers>.*))?$", re.DOTALL
+)
+RE_COMPILER_LINE = re.compile(
+    r"^\s*[<{]\{\s*compiler\(['\"]\w+['\"]\)\s*\}\}\s*$", re.MULTILINE
+)
+RE_SDIST_METADATA_FILE = re.compile(
+    r"^(setup\.py|setup\.cfg|pyproject\.toml|PKG-INFO"
+    r"|LICEN[SC]E.*|COPYING.*|COPYRIGHT.*|NOTICE.*|README.*)$",
+    re.IGNORECASE,
+)
 PIN_PKG_COMPILER = {"numpy": "<{ pin_compatible('numpy') }}"}
+SETUP_PY_RUN_TIMEOUT = 600
+CMP_OPERATOR_CODE = {"==": 0, "!=": 1, "<": 2, "<=": 3, ">": 4, ">=": 5}
+
+# verdicts returned by _evaluate_py_selectors for each dependency
+SELECTOR_DROP = 0
+SELECTOR_KEEP_STRIPPED = 1
+SELECTOR_KEEP = 2
+
+# pooled session shared by every HTTP call in this module so that a batch run
+# reuses the same keep-alive connections to PyPI instead of paying the TLS
+# handshake once per sdist
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    ),
+)
+
+
+@lru_cache(maxsize=35)
+def _search_shallow_file(path_folder: str, filename: str) -> Optional[str]:
+    """Look for the given file in the folder itself and in its first level
+    of subdirectories before falling back to a recursive walk. Sdists unpack
+    to a single ``<pkg>-<version>`` folder, so the file is almost always at
+    depth one and walking the whole tree would waste one stat call per file
+    in the package."""
+    direct = os.path.join(path_folder, filename)
+    if os.path.isfile(direct):
+        return direct
+    try:
+        with os.scandir(path_folder) as folder_iter:
+            subdirs = sorted(entry.path for entry in folder_iter if entry.is_dir())
+    except OSError:
+        return None
+    for subdir in subdirs:
+        candidate = os.path.join(subdir, filename)
+        if os.path.isfile(candidate):
+            return candidate
+    for found in Path(path_folder).rglob(filename):
+        return str(found)
+    return None
 
 
 def search_setup_root(path_folder: Union[Path, str]) -> Path:
-    if setup_py := list(Path(path_folder).rglob("setup.py")):
-        return setup_py[0]
-    if setup_cfg := list(Path(path_folder).rglob("setup.cfg")):
-        return setup_cfg[0]
-    if pyproject_toml := list(Path(path_folder).rglob("pyproject.toml")):
-        return pyproject_toml[0]
+    for filename in ("setup.py", "setup.cfg", "pyproject.toml"):
+        if found := _search_shallow_file(str(path_folder), filename):
+            return Path(found)
+
+
+def _selector_filter_kernel(op_codes, selector_keys, min_key):
+    result = [0] * len(op_codes)
+    for pos in range(len(op_codes)):
+        op_code = op_codes[pos]
+        selector_key = selector_keys[pos]
+        if op_code == 0:
+            enabled = min_key == selector_key
+        elif op_code == 1:
+            enabled = min_key != selector_key
+        elif op_code == 2:
+            enabled = min_key < selector_key
+        elif op_code == 3:
+            enabled = min_key <= selector_key
+        elif op_code == 4:
+            enabled = min_key > selector_key
+        else:
+            enabled = min_key >= selector_key
+        if not enabled:
+            result[pos] = 0
+        elif selector_key < min_key:
+            result[pos] = 1
+        else:
+            result[pos] = 2
+    return result
+
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _selector_filter_kernel(op_codes, selector_keys, min_key):  # noqa: F811
+        result = np.zeros(op_codes.shape[0], dtype=np.int8)
+        for pos in range(op_codes.shape[0]):
+            op_code = op_codes[pos]
+            selector_key = selector_keys[pos]
+            if op_code == 0:
+                enabled = min_key == selector_key
+            elif op_code == 1:
+                enabled = min_key != selector_key
+            elif op_code == 2:
+                enabled = min_key < selector_key
+            elif op_code == 3:
+                enabled = min_key <= selector_key
+            elif op_code == 4:
+                enabled = min_key > selector_key
+            else:
+                enabled = min_key >= selector_key
+            if not enabled:
+                result[pos] = 0
+            elif selector_key < min_key:
+                result[pos] = 1
+            else:
+                result[pos] = 2
+        return result
+
+
+def _evaluate_py_selectors(
+    selectors: List[Tuple[str, int, int]], py_ver_min: PyVer
+) -> List[int]:
+    """Evaluate the python selectors against the minimum supported version.
+    The comparison loop runs inside a numba kernel when numba is available,
+    otherwise a pure Python version of the same kernel is used.
+
+    :param selectors: List of tuples with the operator, major and minor
+     version extracted from each selector
+    :param py_ver_min: Minimum Python version supported
+    :return: For each selector, SELECTOR_DROP, SELECTOR_KEEP_STRIPPED or
+     SELECTOR_KEEP
+    """
+    # encode each version as a single integer so the kernel only compares ints
+    op_codes = [CMP_OPERATOR_CODE[op] for op, _, _ in selectors]
+    selector_keys = [major * 1000 + minor for _, major, minor in selectors]
+    min_key = py_ver_min.major * 1000 + py_ver_min.minor
+    if numba is None:
+        return _selector_filter_kernel(op_codes, selector_keys, min_key)
+    return _selector_filter_kernel(
+        np.asarray(op_codes, dtype=np.int8),
+        np.asarray(selector_keys, dtype=np.int64),
+        min_key,
+    ).tolist()
 
 
 def clean_deps_for_conda_forge(list_deps: List, py_ver_min: PyVer) -> List:
     """Remove dependencies which conda-forge is not supporting anymore.
     For example Python 2.7, Python version less than 3.6"""
-    re_delimiter = re.compile(r"#\s+\[py\s*(?:([<>=!]+))?\s*(\d+)\]\s*$", re.DOTALL)
-    result_deps = []
+    # A single scan over all dependencies is cheaper than invoking the
+    # regex engine once per line. The match offsets are mapped back to the
+    # original rows through a bisect on the row offsets.
+    joined_deps = "\n".join(list_deps)
+    offsets = []
+    position = 0
     for dependency in list_deps:
-        match_del = re_delimiter.search(dependency)
-        if match_del is None:
+        offsets.append(position)
+        position += len(dependency) + 1
+    row_selector = {
+        bisect_right(offsets, match_del.start()) - 1: match_del.groups()
+        for match_del in RE_PY_SELECTOR.finditer(joined_deps)
+    }
+    rows = sorted(row_selector)
+    parsed_selectors = []
+    for row in rows:
+        op, ver = row_selector[row]
+        parsed_selectors.append(
+            (op or "==", int(ver[0]), int(ver[1:].replace("k", "0") or 0))
+        )
+    verdicts = dict(zip(rows, _evaluate_py_selectors(parsed_selectors, py_ver_min)))
+    result_deps = []
+    for row, dependency in enumerate(list_deps):
+        verdict = verdicts.get(row, SELECTOR_KEEP)
+        if verdict == SELECTOR_KEEP:
             result_deps.append(dependency)
-            continue
-
-        match_del = match_del.groups()
-        if not match_del[0]:
-            match_del = ("==", match_del[1])
-        major = int(match_del[1][0])
-        minor = int(match_del[1][1:].replace("k", "0") or 0)
-        py_ver_min = Version(f"{py_ver_min.major}.{py_ver_min.minor}")
-        current_py = SpecifierSet(f"{match_del[0]}{major}.{minor}")
-        log.debug(f"Evaluating: {py_ver_min}{match_del}{current_py} -- {dependency}")
-        if py_ver_min in current_py:
-            if Version(f"{major}.{minor}") in SpecifierSet(
-                f"<{py_ver_min.major}.{py_ver_min.minor}"
-            ):
-                result_deps.append(dependency.split("#")[0].strip())
-            else:
-                result_deps.append(dependency)
+        elif verdict == SELECTOR_KEEP_STRIPPED:
+            result_deps.append(dependency.split("#")[0].strip())
     return result_deps
 
 
+@lru_cache(maxsize=4096)
 def pkg_name_from_sdist_url(sdist_url: str):
     """This method extracts and returns the name of the package from the sdist
     url."""
@@ -103,7 +284,7 @@ def parse_extra_metadata_to_selector(option: str, operation: str, value: str) ->
         value = "".join(value[:2])
         return f"py{operation}{value}"
     if option == "sys_platform":
-        value = re.sub(r"[^a-zA-Z]+", "", value)
+        value = RE_NON_ALPHABETIC.sub("", value)
         if operation == "!=":
             return f"not {value.lower()}"
         return value.lower()
@@ -124,13 +305,38 @@ def get_extra_from_requires_dist(string_parse: str) -> Union[List]:
     :param string_parse: metadata extra
     :return: return the option , operation and value of the extra metadata
     """
-    return re.findall(
-        r"(?:(\())?\s*([\.a-zA-Z0-9-_]+)\s*([=!<>]+)\s*[\'\"]*"
-        r"([\.a-zA-Z0-9-_]+)[\'\"]*\s*(?:(\)))?\s*(?:(and|or))?",
-        string_parse,
+    return RE_EXTRA_REQUIRES_DIST.findall(string_parse)
+
+
+@dataclass
+class ParsedRequirement:
+    """Requirement extracted from a single requires_dist line"""
+
+    name: str
+    version: str = ""
+    extras: List = field(default_factory=list)
+
+
+def parse_requires_dist(string_parse: str) -> ParsedRequirement:
+    """Parse a requires_dist line in a single regex pass, extracting the
+    package name, the version constraint and the environment markers, instead
+    of walking the same text once for each of them.
+
+    :param string_parse: requires_dist value from PyPi metadata
+    :return: ParsedRequirement with the name, version and parsed markers
+    """
+    match_req = RE_REQUIRES_DIST.match(string_parse)
+    version = RE_PARENTHESES.sub("", match_req.group("version") or "").strip()
+    markers = match_req.group("markers")
+    extras = []
+    if markers:
+        extras = get_extra_from_requires_dist(markers.split(";")[0])
+    return ParsedRequirement(
+        name=match_req.group("name"), version=version, extras=extras
     )
 
 
+@lru_cache(maxsize=4096)
 def get_name_version_from_requires_dist(string_parse: str) -> Tuple[str, str]:
     """Extract the name and the version from `requires_dist` present in
     PyPi`s metadata
@@ -138,12 +344,12 @@ def get_name_version_from_requires_dist(string_parse: str) -> Tuple[str, str]:
     :param string_parse: requires_dist value from PyPi metadata
     :return: Name and version of a package
     """
-    pkg = re.match(r"^\s*([^\s]+)\s*([\(]*.*[\)]*)?\s*", string_parse, re.DOTALL)
+    pkg = RE_PKG_NAME_VERSION.match(string_parse)
     pkg_name = pkg.group(1).strip()
     version = ""
     if len(pkg.groups()) > 1 and pkg.group(2):
         version = " " + pkg.group(2).strip()
-    return pkg_name.strip(), re.sub(r"[\(\)]", "", version).strip()
+    return pkg_name.strip(), RE_PARENTHESES.sub("", version).strip()
 
 
 def generic_py_ver_to(
@@ -155,10 +361,7 @@ def generic_py_ver_to(
     # TODO: Refactor the entire function to use LooseVersion instead of custom PyVer
     if not metadata.get("requires_python"):
         return None
-    req_python = re.findall(
-        r"([~><=!]+)\s*(\d+)(?:\.(\d+))?",
-        metadata["requires_python"],
-    )
+    req_python = RE_REQUIRES_PYTHON.findall(metadata["requires_python"])
     if not req_python:
         return None
 
@@ -211,16 +414,106 @@ def generic_py_ver_to(
     return None
 
 
+def get_build_requirements(folder: str) -> List[str]:
+    """Collect the requirements declared as necessary to build the package:
+    the ``build-system.requires`` list from the pyproject.toml plus the
+    ``setup_requires`` entries from the setup.cfg.
+
+    :param folder: Path to the folder where the sdist was unpacked
+    :return: List with all declared build requirements
+    """
+    requirements = []
+    path_pyproject = _search_shallow_file(str(folder), "pyproject.toml")
+    if path_pyproject:
+        try:
+            with open(path_pyproject, "rb") as pyproject_file:
+                toml_metadata = tomli.load(pyproject_file)
+        except tomli.TOMLDecodeError as err:
+            log.debug(f"It was not possible to parse {path_pyproject}: {err}")
+        else:
+            requirements += toml_metadata.get("build-system", {}).get("requires", [])
+    try:
+        setup_cfg = get_setup_cfg(folder)
+    except Exception as err:
+        # a setup.cfg that cannot be parsed yet (e.g. an attr: directive
+        # importing a module whose dependencies are not installed at this
+        # point) must not prevent the setup.py from running at all
+        log.debug(f"It was not possible to read the setup.cfg: {err}")
+        setup_cfg = {}
+    requirements += setup_cfg.get("setup_requires") or []
+    return requirements
+
+
+def _requirement_name(requirement: str) -> Optional[str]:
+    """Return the lowercase package name of a requirement string, or None
+    when the requirement does not start with a valid name."""
+    match = RE_DEPS_NAME.match(requirement)
+    return match.group(0).lower() if match else None
+
+
 def install_deps_if_necessary(setup_path: str, data_dist: dict, pip_dir: str):
-    """Install missing dependencies to run the setup.py
+    """Install the dependencies needed to run the setup.py with a single
+    `pip` invocation. The list combines the build requirements declared in
+    pyproject.toml/setup.cfg with the third party modules imported by the
+    setup.py itself, so the script does not need to be executed once per
+    missing module.
 
     :param setup_path: path to the setup.py
     :param data_dist: metadata
     :param pip_dir: path where the missing packages will be downloaded
     """
     all_setup_deps = get_vendored_dependencies(setup_path)
-    for dep in all_setup_deps:
-        pip_install_dep(data_dist, dep, pip_dir)
+    dep_names = {_requirement_name(dep) for dep in all_setup_deps}
+    for dep in get_build_requirements(os.path.dirname(setup_path)):
+        dep_name = _requirement_name(dep)
+        if dep_name is None:
+            log.debug(f"Skipping malformed build requirement: {dep}")
+            continue
+        if dep_name not in dep_names:
+            all_setup_deps.append(dep)
+    pip_install_deps(data_dist, all_setup_deps, pip_dir)
+
+
+def pip_install_deps(data_dist: dict, dep_list: List[str], pip_dir: str):
+    """Install all given dependencies using a single `pip` call, falling
+    back to one call per dependency when the combined resolution fails.
+
+    :param data_dist: sdist metadata
+    :param dep_list: Requirements which will be installed
+    :param pip_dir: Path to the folder where `pip` will let the packages
+    """
+    dep_list = ["setuptools" if dep == "pkg_resources" else dep for dep in dep_list]
+    if not dep_list:
+        return
+    try:
+        check_output(
+            [
+                sys.executable,
+                "-m",
+                "pip",
+                "install",
+                *dep_list,
+                f"--target={pip_dir}",
+            ]
+        )
+    except Exception as err:
+        log.debug(
+            f"It was not possible to install {', '.join(dep_list)} in a single"
+            f" pip call, retrying one at a time. Error: {err}"
+        )
+        for dep in dep_list:
+            pip_install_dep(data_dist, dep, pip_dir)
+    else:
+        if not data_dist.get("setup_requires"):
+            data_dist["setup_requires"] = []
+        for dep in dep_list:
+            dep_name = _requirement_name(dep)
+            if (
+                dep_name is not None
+                and dep_name not in data_dist["setup_requires"]
+                and dep_name != "setuptools"
+            ):
+                data_dist["setup_requires"].append(dep_name)
 
 
 def pip_install_dep(data_dist: dict, dep_name: str, pip_dir: str):
@@ -267,7 +560,14 @@ def merge_sdist_metadata(setup_py: dict, setup_cfg: dict) -> dict:
     :param setup_cfg: Metadata from setup.cfg
     :return: Return the merged data from setup.py and setup.cfg
     """
-    result = deepcopy(setup_py)
+    result = dict(setup_py)
+    # the merges below replace these values, so shallow copies of the
+    # affected containers are enough, no need to deep copy the whole metadata
+    for key in ("install_requires", "setup_requires", "compilers"):
+        if isinstance(result.get(key), list):
+            result[key] = list(result[key])
+    if isinstance(result.get("extras_require"), dict):
+        result["extras_require"] = dict(result["extras_require"])
     for key, value in setup_cfg.items():
         if key not in result:
             result[key] = value
@@ -283,6 +583,94 @@ def merge_sdist_metadata(setup_py: dict, setup_cfg: dict) -> dict:
     return result
 
 
+SETUP_CFG_DYNAMIC_DIRECTIVES = ("attr:", "file:", "find:", "find_namespace:")
+SETUP_CFG_LIST_KEYS = {
+    "classifiers",
+    "install_requires",
+    "keywords",
+    "packages",
+    "py_modules",
+    "scripts",
+    "setup_requires",
+    "tests_require",
+}
+
+
+def _split_setup_cfg_list(value: str) -> List[str]:
+    if "\n" in value:
+        return [line.strip() for line in value.splitlines() if line.strip()]
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _read_setup_cfg_with_setuptools(path_setup_cfg: str) -> dict:
+    try:
+        from setuptools.config.setupcfg import read_configuration
+    except ImportError:
+        from setuptools.config import read_configuration
+
+    return dict(read_configuration(path_setup_cfg))
+
+
+@lru_cache(maxsize=35)
+def _read_setup_cfg(path_setup_cfg: str, mtime: float) -> dict:
+    """Parse the setup.cfg with the stdlib configparser, which is much
+    cheaper than setuptools' read_configuration. Whenever the file relies on
+    dynamic directives (``attr:``, ``file:``, ``find:``) which configparser
+    cannot resolve, it falls back to setuptools. The mtime is part of the
+    cache key only to invalidate the entry when the file changes.
+
+    :param path_setup_cfg: Path to the setup.cfg
+    :param mtime: Modification time of the setup.cfg
+    :return: Parsed configuration split in ``metadata`` and ``options``
+    """
+    # setup.cfg does not use configparser interpolation and a bare % in a
+    # value would raise lazily when the sections are read back
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        with open(path_setup_cfg, encoding="utf-8") as cfg_file:
+            parser.read_string(cfg_file.read())
+    except (OSError, UnicodeError, configparser.Error) as err:
+        log.debug(f"configparser was not able to read the setup.cfg: {err}")
+        return _read_setup_cfg_with_setuptools(path_setup_cfg)
+
+    metadata = {}
+    options = {}
+    for section_name in parser.sections():
+        if section_name not in (
+            "metadata",
+            "options",
+            "options.extras_require",
+            "options.entry_points",
+        ):
+            continue
+        section = dict(parser.items(section_name))
+        if any(
+            value.strip().startswith(SETUP_CFG_DYNAMIC_DIRECTIVES)
+            for value in section.values()
+        ):
+            log.debug(
+                f"Dynamic directive found on setup.cfg ({section_name}),"
+                " falling back to setuptools to parse it."
+            )
+            return _read_setup_cfg_with_setuptools(path_setup_cfg)
+        if section_name in ("metadata", "options"):
+            target = metadata if section_name == "metadata" else options
+            target.update(
+                {
+                    key: _split_setup_cfg_list(value)
+                    if key in SETUP_CFG_LIST_KEYS
+                    else value
+                    for key, value in section.items()
+                }
+            )
+        else:
+            sub_key = section_name.split(".", 1)[1]
+            options[sub_key] = {
+                key: _split_setup_cfg_list(value) for key, value in section.items()
+            }
+    return {"metadata": metadata, "options": options}
+
+
 def get_setup_cfg(source_path: str) -> dict:
     """Method responsible to extract the setup.cfg metadata
 
@@ -290,20 +678,15 @@ def get_setup_cfg(source_path: str) -> dict:
      files unpacked
     :return: Metadata of setup.cfg
     """
-    try:
-        from setuptools.config.setupcfg import read_configuration
-    except ImportError:
-        from setuptools.config import read_configuration
-
     log.debug(f"Started setup.cfg from {source_path}")
     print_msg("Recovering metadata from setup.cfg")
-    path_setup_cfg = list(Path(source_path).rglob("setup.cfg"))
+    path_setup_cfg = _search_shallow_file(str(source_path), "setup.cfg")
     if not path_setup_cfg:
         return {}
-    path_setup_cfg = path_setup_cfg[0]
 
-    setup_cfg = read_configuration(str(path_setup_cfg))
-    setup_cfg = dict(setup_cfg)
+    setup_cfg = deepcopy(
+        _read_setup_cfg(str(path_setup_cfg), os.path.getmtime(path_setup_cfg))
+    )
     if setup_cfg.get("options", {}).get("python_requires"):
         setup_cfg["options"]["python_requires"] = ensure_pep440(
             str(setup_cfg["options"]["python_requires"])
@@ -322,8 +705,10 @@ def injection_distutils(folder: str) -> dict:
     """This is a bit of "dark magic", please don't do it at home.
     It is injecting code in the distutils.core.setup and replacing the
     setup function by the inner function __fake_distutils_setup.
-    This method is a contextmanager, after leaving the context it will return
-    with the normal implementation of the distutils.core.setup.
+    The injection happens in a child interpreter (see ``_setup_py_child``),
+    so the current directory, ``sys.path`` and ``distutils.core.setup``
+    of the main process are never touched, which also makes this step safe
+    to run in parallel for several packages.
     This method is necessary for two reasons:
     -pypi metadata for some packages might be absent from the pypi API.
     -pypi metadata, when present, might be missing some information.
@@ -331,13 +716,83 @@ def injection_distutils(folder: str) -> dict:
     :param folder: Path to the folder where the sdist package was extracted
     :yield: return the metadata from sdist
     """
-    from distutils import core
+    path_setup = str(search_setup_root(folder))
+    data_dist = {}
+    try:
+        print_msg("Executing injected distutils...")
+        data_dist = __run_setup_py(path_setup)
+        if not data_dist or not data_dist.get("install_requires", None):
+            print_msg(
+                "No data was recovered from setup.py."
+                " Forcing to execute the setup.py as script"
+            )
+            data_dist = __run_setup_py(path_setup, run_py=True) or data_dist
+        yield data_dist
+    except BaseException as err:
+        log.debug(f"Exception occurred when executing sdist injection: {err}")
+        yield data_dist
 
-    setup_core_original = core.setup
-    old_dir = os.getcwd()
-    path_setup = search_setup_root(folder)
-    os.chdir(os.path.dirname(str(path_setup)))
 
+def __run_setup_py(path_setup: str, run_py=False) -> dict:
+    """Method responsible to run the setup.py in a child interpreter. The
+    child performs the distutils injection and writes the recovered metadata
+    as JSON to a temporary file which is parsed back here.
+
+    :param path_setup: full path to the setup.py
+    :param run_py: If it should run the setup.py with run_py, otherwise it will run
+    invoking the distutils directly
+    :return: metadata recovered from the setup.py
+    """
+    temp_folder = mkdtemp(prefix="grayskull-setup-py-")
+    output_json = os.path.join(temp_folder, "setup_metadata.json")
+    try:
+        child = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys;"
+                " from grayskull.strategy.py_base import _setup_py_child;"
+                " _setup_py_child(sys.argv[1], sys.argv[2],"
+                " run_py=sys.argv[3] == '1')",
+                path_setup,
+                output_json,
+                "1" if run_py else "0",
+            ],
+            capture_output=True,
+            timeout=SETUP_PY_RUN_TIMEOUT,
+        )
+        if child.returncode != 0:
+            log.debug(
+                f"setup.py child process exited with {child.returncode}."
+                f" stderr: {child.stderr}"
+            )
+    except subprocess.TimeoutExpired:
+        log.debug(f"Timeout when executing the setup.py: {path_setup}")
+    data_dist = {}
+    if os.path.isfile(output_json):
+        try:
+            with open(output_json) as setup_metadata_file:
+                data_dist = json.load(setup_metadata_file)
+        except ValueError as err:
+            log.debug(f"Invalid metadata received from the setup.py child: {err}")
+    shutil.rmtree(temp_folder, ignore_errors=True)
+    log.debug(f"Data recovered from setup.py: {data_dist}")
+    return data_dist
+
+
+def _setup_py_child(path_setup: str, output_json: str, run_py=False):
+    """Entry point of the child interpreter spawned by ``__run_setup_py``.
+    It patches ``distutils.core.setup``, executes the setup.py and dumps the
+    captured metadata as JSON to ``output_json``. All the global state
+    mutation (cwd, ``sys.path``, ``core.setup``) stays in this process.
+
+    :param path_setup: full path to the setup.py
+    :param output_json: path of the file where the metadata will be written
+    :param run_py: If it should run the setup.py with run_py, otherwise it will run
+    invoking the distutils directly
+    """
+    setup_core_original = core.setup
+    os.chdir(os.path.dirname(path_setup))
     data_dist = {}
 
     def __fake_distutils_setup(*args, **kwargs):
@@ -349,15 +804,17 @@ def injection_distutils(folder: str) -> dict:
             val_deps = kwargs.get(key_deps)
             if not val_deps:
                 return val_deps
-            list_req = []
             if isinstance(val_deps, str):
                 val_deps = [val_deps]
-            for val in val_deps:
-                if isinstance(val, (tuple, list)):
-                    list_req.extend(list(map(str, val)))
-                else:
-                    list_req.append(str(val))
-            return list_req
+            return list(
+                map(
+                    str,
+                    chain.from_iterable(
+                        val if isinstance(val, (tuple, list)) else (val,)
+                        for val in val_deps
+                    ),
+                )
+            )
 
         if "setup_requires" in kwargs:
             kwargs["setup_requires"] = _fix_list_requirements("setup_requires")
@@ -400,34 +857,26 @@ def injection_distutils(folder: str) -> dict:
 
     try:
         core.setup = __fake_distutils_setup
-        path_setup = str(path_setup)
-        print_msg("Executing injected distutils...")
-        __run_setup_py(path_setup, data_dist)
-        if not data_dist or not data_dist.get("install_requires", None):
-            print_msg(
-                "No data was recovered from setup.py."
-                " Forcing to execute the setup.py as script"
-            )
-            __run_setup_py(path_setup, data_dist, run_py=True)
-        yield data_dist
-    except BaseException as err:
-        log.debug(f"Exception occurred when executing sdist injection: {err}")
-        yield data_dist
+        _execute_setup_py(path_setup, data_dist, run_py=run_py)
     finally:
         core.setup = setup_core_original
-        os.chdir(old_dir)
+        with open(output_json, "w") as setup_metadata_file:
+            json.dump(data_dist, setup_metadata_file, default=str)
 
 
-def __run_setup_py(path_setup: str, data_dist: dict, run_py=False, deps_installed=None):
-    """Method responsible to run the setup.py
+def _execute_setup_py(path_setup: str, data_dist: dict, run_py=False):
+    """Execute the setup.py with the distutils injection already in place.
+    It runs in the child interpreter spawned by ``__run_setup_py``. All
+    the requirements needed to run the script are installed beforehand,
+    so the setup.py is executed a single time.
 
     :param path_setup: full path to the setup.py
     :param data_dist: metadata
     :param run_py: If it should run the setup.py with run_py, otherwise it will run
     invoking the distutils directly
     """
-    deps_installed = deps_installed or []
-    original_path = deepcopy(sys.path)
+    # sys.path only holds strings, a shallow copy is enough to restore it
+    original_path = sys.path[:]
     pip_dir = mkdtemp(prefix="pip-dir-")
     if not os.path.exists(pip_dir):
         os.mkdir(pip_dir)
@@ -443,18 +892,6 @@ def __run_setup_py(path_setup: str, data_dist: dict, run_py=False, deps_installe
             runpy.run_path(path_setup, run_name="__main__")
         else:
             core.run_setup(path_setup, script_args=["install", f"--target={pip_dir}"])
-    except ModuleNotFoundError as err:
-        log.debug(
-            f"When executing setup.py did not find the module: {err.name}."
-            f" Exception: {err}"
-        )
-        dep_install = err.name
-        if dep_install in deps_installed:
-            dep_install = dep_install.split(".")[0]
-        if dep_install not in deps_installed:
-            deps_installed.append(dep_install)
-            pip_install_dep(data_dist, dep_install, pip_dir)
-            __run_setup_py(path_setup, data_dist, run_py, deps_installed=deps_installed)
     except Exception as err:
         log.debug(f"Exception when executing setup.py as script: {err}")
     data_dist.update(
@@ -500,8 +937,17 @@ def get_py_multiple_selectors(
             if is_selector
             else config.get_oldest_py3_version(list(selectors.keys()))
         )
-    for py_ver, is_enabled in selectors.items():
-        if (not config.is_strict_cf and py_ver == PyVer(2, 7)) or is_enabled:
+    py_vers = list(selectors.keys())
+    if np is not None:
+        enabled = np.fromiter(selectors.values(), dtype=np.bool_, count=len(py_vers))
+        disabled_rows = np.where(~enabled)[0]
+    else:
+        disabled_rows = [
+            row for row, is_enabled in enumerate(selectors.values()) if not is_enabled
+        ]
+    for row in disabled_rows:
+        py_ver = py_vers[row]
+        if not config.is_strict_cf and py_ver == PyVer(2, 7):
             continue
         all_selector += (
             [f"py=={py_ver.major}{py_ver.minor}"]
@@ -535,10 +981,7 @@ def update_requirements_with_pin(requirements: dict):
     def is_compiler_present() -> bool:
         if "build" not in requirements:
             return False
-        re_compiler = re.compile(
-            r"^\s*[<{]\{\s*compiler\(['\"]\w+['\"]\)\s*\}\}\s*$", re.MULTILINE
-        )
-        return any(re_compiler.match(build) for build in requirements["build"])
+        return any(RE_COMPILER_LINE.match(build) for build in requirements["build"])
 
     if not is_compiler_present():
         return
@@ -664,30 +1107,49 @@ def get_entry_points_from_sdist(sdist_metadata: dict) -> List:
     return []
 
 
-def download_sdist_pkg(sdist_url: str, dest: str, name: Optional[str] = None):
+def download_sdist_pkg(sdist_url: str, dest: str, name: Optional[str] = None) -> str:
     """Download the sdist package
 
     :param sdist_url: sdist url
     :param dest: Folder were the method will download the sdist
+    :return: sha256 of the downloaded file, computed while streaming so the
+     file does not need to be read back from disk
     """
     print_msg(
         f"{Fore.GREEN}Starting the download of the sdist package"
         f" {Fore.BLUE}{Style.BRIGHT}{name}"
     )
     log.debug(f"Downloading {name} sdist - {sdist_url}")
-    response = requests.get(sdist_url, allow_redirects=True, stream=True, timeout=5)
+    response = _SESSION.get(sdist_url, allow_redirects=True, stream=True, timeout=5)
     response.raise_for_status()
     total_size = int(response.headers.get("Content-length", 0))
+    chunk_size = 64 * 1024
+    sha256 = hashlib.sha256()
+    if not CLIConfig().stdout:
+        # there is no progress to report, skip the progress bar bookkeeping
+        response.raw.decode_content = True
+        with open(dest, "wb") as pkg_file:
+            while chunk_data := response.raw.read(chunk_size):
+                pkg_file.write(chunk_data)
+                sha256.update(chunk_data)
+        return sha256.hexdigest()
     with manage_progressbar(max_value=total_size, prefix=f"{name} ") as bar, open(
         dest, "wb"
     ) as pkg_file:
         progress_val = 0
-        chunk_size = 512
+        last_reported = 0
         for chunk_data in response.iter_content(chunk_size=chunk_size):
             if chunk_data:
                 pkg_file.write(chunk_data)
-                progress_val += chunk_size
-                bar.update(min(progress_val, total_size))
+                sha256.update(chunk_data)
+                progress_val += len(chunk_data)
+                # updating the progress bar for every chunk is not worth
+                # the cost of redrawing it
+                if progress_val - last_reported >= chunk_size * 4:
+                    bar.update(min(progress_val, total_size))
+                    last_reported = progress_val
+        bar.update(min(progress_val, total_size))
+    return sha256.hexdigest()
 
 
 def merge_deps_toml_setup(setup_deps: list, toml_deps: list) -> list:
@@ -751,6 +1213,205 @@ def merge_setup_toml_metadata(setup_metadata: dict, pyproject_metadata: dict) ->
     return setup_metadata
 
 
+def split_deps_by_extra(requires_dist: List[str]) -> Tuple[List[str], Dict]:
+    """Split a list of ``Requires-Dist`` style requirements into the plain
+    install requirements and the ones guarded by an ``extra ==`` marker,
+    keeping any other marker clause attached to the requirement.
+
+    :param requires_dist: List with the raw requirement strings
+    :return: Tuple with the install requirements and a dict mapping each
+     extra to its requirements
+    """
+    install_requires = []
+    extras_require = defaultdict(list)
+    for requirement in requires_dist:
+        req, _, marker = (part.strip() for part in requirement.partition(";"))
+        extra = None
+        other_clauses = []
+        for clause in RE_MARKER_AND.split(marker) if marker else []:
+            match_extra = RE_EXTRA_MARKER.search(clause)
+            if match_extra and extra is None:
+                extra = match_extra.group(1)
+            else:
+                other_clauses.append(clause)
+        if other_clauses:
+            req = f"{req}; {' and '.join(other_clauses)}"
+        if extra is None:
+            install_requires.append(req)
+        else:
+            extras_require[extra].append(req)
+    return install_requires, dict(extras_require)
+
+
+def parse_core_metadata(raw_metadata: bytes) -> dict:
+    """Parse a core metadata file (the RFC 822 format used by ``PKG-INFO``
+    and by the PEP 658 ``.metadata`` files) returning a dictionary with the
+    same shape as the one produced by ``injection_distutils``.
+
+    :param raw_metadata: Content of the core metadata file
+    :return: Metadata in the ``injection_distutils`` format
+    """
+    msg = BytesParser().parsebytes(raw_metadata)
+    install_requires, extras_require = split_deps_by_extra(
+        msg.get_all("Requires-Dist") or []
+    )
+    metadata = {"install_requires": install_requires}
+    if extras_require:
+        metadata["extras_require"] = extras_require
+    for key, metadata_field in (
+        ("name", "Name"),
+        ("version", "Version"),
+        ("summary", "Summary"),
+        ("author", "Author"),
+        ("license", "License"),
+        ("url", "Home-page"),
+        ("python_requires", "Requires-Python"),
+    ):
+        if msg.get(metadata_field):
+            metadata[key] = msg.get(metadata_field)
+    return metadata
+
+
+def get_pep658_metadata(sdist_url: str, config: Configuration) -> Optional[dict]:
+    """Try to recover the package metadata from the PEP 658 ``.metadata``
+    file which the package index might expose alongside the package file.
+    When available it avoids downloading and unpacking the whole sdist just
+    to read its metadata.
+
+    :param sdist_url: URL to the sdist package
+    :param config: package configuration
+    :return: Metadata in the ``injection_distutils`` format or None when the
+     index does not expose the metadata file
+    """
+    metadata_url = f"{sdist_url}.metadata"
+    log.debug(f"Checking for PEP 658 metadata - {metadata_url}")
+    try:
+        response = _SESSION.get(metadata_url, allow_redirects=True, timeout=5)
+    except requests.RequestException as err:
+        log.debug(f"Requesting the PEP 658 metadata failed: {err}")
+        return None
+    if response.status_code != 200 or not response.content:
+        return None
+    metadata = parse_core_metadata(response.content)
+    if not metadata.get("name") or not metadata.get("install_requires"):
+        # incomplete metadata, the sdist itself is the only reliable source
+        return None
+    print_msg("Recovered metadata from the PEP 658 metadata file")
+    return metadata
+
+
+METADATA_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "grayskull"
+    / "metadata"
+)
+
+
+def _get_remote_etag(sdist_url: str) -> Optional[str]:
+    """Return the ETag (or Last-Modified) reported by the package index for
+    the given url. It is used to invalidate the on disk metadata cache when
+    the package file changes."""
+    try:
+        response = _SESSION.head(sdist_url, allow_redirects=True, timeout=5)
+    except requests.RequestException as err:
+        log.debug(f"It was not possible to check the ETag for {sdist_url}: {err}")
+        return None
+    if response.status_code != 200:
+        return None
+    return response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+
+# keys which are only meaningful for the run that produced them, such as
+# paths to temporary folders, and therefore must never be persisted as-is
+VOLATILE_METADATA_KEYS = ("sdist_path",)
+
+
+def _persist_license_files(sdist_path: Optional[str], files_dir: Path) -> Optional[str]:
+    """Copy the license files found in the unpacked sdist to a stable folder
+    inside the cache, preserving their relative layout. License-file
+    discovery only needs those files from the sdist tree, so pointing
+    ``sdist_path`` at this folder makes a warm-cache run find the same
+    license, with the same relative path, as the run that populated the
+    cache.
+
+    :param sdist_path: Folder where the sdist was unpacked
+    :param files_dir: Folder inside the cache to receive the license files
+    :return: The cache folder when at least one license file was copied
+    """
+    if not sdist_path or not os.path.isdir(sdist_path):
+        return None
+    copied = False
+    try:
+        for license_sdist in search_license_folder(sdist_path):
+            rel_path = os.path.relpath(license_sdist.path, sdist_path)
+            dest = files_dir / rel_path
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(license_sdist.path, dest)
+            copied = True
+    except OSError as err:
+        log.debug(f"It was not possible to persist the license files: {err}")
+        return None
+    return str(files_dir) if copied else None
+
+
+def persistent_metadata_cache(func):
+    """Decorator responsible to cache the sdist metadata on disk
+    (``~/.cache/grayskull/metadata``), avoiding to download and unpack the
+    same sdist again on repeated runs. The cache is keyed by the sdist url
+    and the ETag reported by the package index, so a re-uploaded package
+    file invalidates the cached entry. An in-process dictionary also caches
+    the result so repeated calls in the same run skip even the ETag check.
+    Both layers hand out copies, so the callers can mutate the returned
+    metadata freely. The ``sdist_path`` temporary folder is not persisted
+    as-is; the license files it contains are copied next to the cache entry
+    so license-file discovery behaves the same on a warm hit."""
+    in_process_cache = {}
+
+    @wraps(func)
+    def wrapper(sdist_url: str, config, with_source: bool = False) -> dict:
+        if config.from_local_sdist or config.download or with_source:
+            # these modes need the package file itself, not only the metadata
+            return func(sdist_url, config, with_source)
+        if sdist_url in in_process_cache:
+            return deepcopy(in_process_cache[sdist_url])
+        etag = _get_remote_etag(sdist_url)
+        cache_file = None
+        if etag:
+            url_hash = hashlib.sha256(f"{sdist_url}@{etag}".encode()).hexdigest()
+            cache_file = METADATA_CACHE_DIR / f"{url_hash}.json"
+            if cache_file.is_file():
+                try:
+                    metadata = json.loads(cache_file.read_text())
+                except (OSError, ValueError) as err:
+                    log.debug(f"Discarding invalid metadata cache entry: {err}")
+                else:
+                    log.debug(f"Metadata for {sdist_url} recovered from {cache_file}")
+                    in_process_cache[sdist_url] = metadata
+                    return deepcopy(metadata)
+        metadata = func(sdist_url, config, with_source)
+        in_process_cache[sdist_url] = metadata
+        if cache_file is not None:
+            persisted = {
+                key: value
+                for key, value in metadata.items()
+                if key not in VOLATILE_METADATA_KEYS
+            }
+            try:
+                METADATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                license_dir = _persist_license_files(
+                    metadata.get("sdist_path"), METADATA_CACHE_DIR / url_hash
+                )
+                if license_dir:
+                    persisted["sdist_path"] = license_dir
+                cache_file.write_text(json.dumps(persisted, default=str))
+            except (OSError, TypeError) as err:
+                log.debug(f"It was not possible to cache the metadata: {err}")
+        return deepcopy(metadata)
+
+    return wrapper
+
+
+@persistent_metadata_cache
 def get_sdist_metadata(
     sdist_url: str, config: Configuration, with_source: bool = False
 ) -> dict:
@@ -761,18 +1422,31 @@ def get_sdist_metadata(
     :param with_source: a boolean value to indicate Github packages
     :return: sdist metadata
     """
+    if config.pypi_metadata_only and not (
+        config.from_local_sdist or config.download or with_source
+    ):
+        # The metadata file (PEP 658) carries the same information as the
+        # PyPI JSON fast path, so it is subject to the same opt-in: it has
+        # no setup_requires, entry points or license files
+        metadata = get_pep658_metadata(sdist_url, config)
+        if metadata is not None:
+            return metadata
+
     temp_folder = mkdtemp(prefix=f"grayskull-{config.name}-")
+    pkg_sha256 = None
     if config.from_local_sdist:
         path_pkg = Path(config.local_sdist).resolve()
     else:
         pkg_name = pkg_name_from_sdist_url(sdist_url)
         path_pkg = os.path.join(temp_folder, pkg_name)
 
-        download_sdist_pkg(sdist_url=sdist_url, dest=path_pkg, name=config.name)
+        pkg_sha256 = download_sdist_pkg(
+            sdist_url=sdist_url, dest=path_pkg, name=config.name
+        )
         if config.download:
             config.files_to_copy.append(path_pkg)
     log.debug(f"Unpacking {path_pkg} to {temp_folder}")
-    shutil.unpack_archive(path_pkg, temp_folder)
+    unpack_sdist(path_pkg, temp_folder)
 
     print_msg("Checking for pyproject.toml")
     pyproject_toml = glob(f"{temp_folder}/**/pyproject.toml", recursive=True)
@@ -791,7 +1465,10 @@ def get_sdist_metadata(
     # At this point the tarball was successfully extracted
     # so we can assume the sha256 can be computed reliably
     if with_source:
-        metadata["source"] = {"url": sdist_url, "sha256": sha256_checksum(path_pkg)}
+        metadata["source"] = {
+            "url": sdist_url,
+            "sha256": pkg_sha256 or sha256_checksum(path_pkg),
+        }
     if config.from_local_sdist:
         metadata["source"] = {
             "url": f"file://{path_pkg}",
@@ -808,6 +1485,92 @@ def get_sdist_metadata(
     return merge_setup_toml_metadata(metadata, pyproject_metadata)
 
 
+def _select_sdist_members(all_members: List[str]) -> Optional[List[str]]:
+    """Return the archive members worth extracting, or None when the whole
+    archive must be unpacked. A sdist shipping a setup.py needs the full tree
+    since the setup.py will be executed and may read any file in it."""
+    selected = []
+    for member in all_members:
+        basename = os.path.basename(member)
+        if basename == "setup.py":
+            return None
+        if RE_SDIST_METADATA_FILE.match(basename):
+            selected.append(member)
+    return selected
+
+
+def unpack_sdist(path_pkg: Union[Path, str], temp_folder: str):
+    """Unpack the sdist package into the given folder. When the sdist does
+    not contain a setup.py, only the metadata, license and readme files are
+    extracted - the remaining content (sources, docs, tests) is only needed
+    to execute a setup.py. Falls back to a full extraction whenever the
+    archive cannot be handled by tarfile/zipfile directly.
+
+    :param path_pkg: Path to the sdist package
+    :param temp_folder: Folder where the package will be unpacked
+    """
+    path_pkg = str(path_pkg)
+    try:
+        if zipfile.is_zipfile(path_pkg):
+            with zipfile.ZipFile(path_pkg) as archive:
+                selected = _select_sdist_members(archive.namelist())
+                archive.extractall(temp_folder, members=selected)
+            return
+        if tarfile.is_tarfile(path_pkg):
+            with tarfile.open(path_pkg, mode="r:*") as archive:
+                selected = _select_sdist_members(archive.getnames())
+                if selected is None:
+                    archive.extractall(temp_folder)
+                else:
+                    for member in selected:
+                        archive.extract(member, temp_folder)
+            return
+    except (tarfile.TarError, zipfile.BadZipFile, KeyError, OSError) as err:
+        log.debug(f"Selective extraction failed ({err}), unpacking everything.")
+    shutil.unpack_archive(path_pkg, temp_folder)
+
+
+def get_sdist_metadata_batch(
+    sdist_url_config_list: List[Tuple[str, Configuration]],
+    with_source: bool = False,
+    max_workers: int = 16,
+) -> List[dict]:
+    """Recover the sdist metadata for multiple packages concurrently.
+
+    The setup.py injection runs in a disposable child interpreter, so the
+    workers only wait on the network and on those children - threads are
+    enough, and they all share the pooled HTTP session. A package which
+    fails does not abort the batch: the failure is logged and its slot in
+    the result is an empty dict.
+
+    :param sdist_url_config_list: List of tuples with the sdist url and the
+     package configuration
+    :param with_source: a boolean value to indicate Github packages
+    :param max_workers: Maximum number of worker threads
+    :return: List with the metadata of each package, in the same order as
+     the input list; packages which failed yield an empty dict
+    """
+    if not sdist_url_config_list:
+        return []
+    max_workers = min(max_workers, len(sdist_url_config_list))
+    all_metadata = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(get_sdist_metadata, sdist_url, config, with_source)
+            for sdist_url, config in sdist_url_config_list
+        ]
+        for (sdist_url, config), future in zip(sdist_url_config_list, futures):
+            try:
+                all_metadata.append(future.result())
+            except Exception as err:
+                log.error(
+                    f"It was not possible to recover the sdist metadata for"
+                    f" {config.name} ({sdist_url}): {err}"
+                )
+                all_metadata.append({})
+    return all_metadata
+
+
 def ensure_pep440_in_req_list(list_req: List[str]) -> List[str]:
     return [ensure_pep440(pkg) for pkg in list_req]
 
@@ -816,7 +1579,7 @@ def split_deps(deps: str) -> List[str]:
     result = []
     for d in deps.split(","):
         constrain = ""
-        for val in re.split(r"([><!=~^]+)", d):
+        for val in RE_SPLIT_CONSTRAIN.split(d):
             if not val:
                 continue
             if {">", "<", "=", "!", "~", "^"} & set(val):
@@ -826,6 +1589,7 @@ def split_deps(deps: str) -> List[str]:
     return result
 
 
+@lru_cache(maxsize=4096)
 def ensure_pep440(pkg: str) -> str:
     if not pkg or RE_PEP725_PURL.match(pkg):
         return pkg
@@ -27,14 +27,14 @@ from grayskull.strategy.py_base import (
     ensure_pep440_in_req_list,
     get_compilers,
     get_entry_points_from_sdist,
-    get_extra_from_requires_dist,
-    get_name_version_from_requires_dist,
     get_sdist_metadata,
     get_test_entry_points,
     get_test_imports,
     parse_extra_metadata_to_selector,
+    parse_requires_dist,
     py_version_to_limit_python,
     py_version_to_selector,
+    split_deps_by_extra,
     update_requirements_with_pin,
 )
 from grayskull.utils import format_dependencies, origin_is_github, rm_duplicated_deps
@@ -211,6 +211,42 @@ def merge_requires_dist(pypi_metadata: dict, sdist_metadata: dict) -> List:
     return requires_dist
 
 
+def pypi_metadata_is_sufficient(pypi_metadata: dict) -> bool:
+    """Test if the PyPI JSON metadata already carries the requirements
+    information, making the sdist download unnecessary.
+
+    :param pypi_metadata: pypi metadata
+    :return: True when the sdist can be skipped
+    """
+    return (
+        pypi_metadata.get("requires_dist") is not None
+        and pypi_metadata.get("requires_python") is not None
+    )
+
+
+def metadata_from_pypi_json(pypi_metadata: dict) -> dict:
+    """Build the sdist metadata directly from the PyPI JSON payload, without
+    downloading and executing the sdist. Keys which can only be recovered
+    from the package files themselves (entry points, compilers, packages)
+    are left out, `merge_pypi_sdist_metadata` treats them as absent.
+
+    :param pypi_metadata: pypi metadata
+    :return: Metadata in the same shape returned by `get_sdist_metadata`
+    """
+    install_requires, extras_require = split_deps_by_extra(
+        pypi_metadata.get("requires_dist") or []
+    )
+    metadata = {"install_requires": install_requires}
+    if extras_require:
+        metadata["extras_require"] = extras_require
+    for key in ("name", "version", "summary", "url", "license"):
+        if pypi_metadata.get(key):
+            metadata[key] = pypi_metadata[key]
+    if pypi_metadata.get("requires_python"):
+        metadata["python_requires"] = pypi_metadata["requires_python"]
+    return metadata
+
+
 def get_origin_wise_metadata(config):
     """Method responsible for extracting metadata based on package origin."""
     if config.repo_github and origin_is_github(config.repo_github):
@@ -233,9 +269,18 @@ def get_origin_wise_metadata(config):
         pypi_metadata = {}
     else:
         pypi_metadata = get_pypi_metadata(config)
-        sdist_metadata = get_sdist_metadata(
-            sdist_url=pypi_metadata["sdist_url"], config=config
-        )
+        if (
+            config.pypi_metadata_only
+            and not config.download
+            and pypi_metadata_is_sufficient(pypi_metadata)
+        ):
+            # the JSON response already has the requirements, the sdist
+            # download and the setup.py execution can be skipped entirely
+            sdist_metadata = metadata_from_pypi_json(pypi_metadata)
+        else:
+            sdist_metadata = get_sdist_metadata(
+                sdist_url=pypi_metadata["sdist_url"], config=config
+            )
     return sdist_metadata, pypi_metadata
 
 
@@ -301,22 +346,16 @@ def get_run_req_from_requires_dist(requires_dist: List, config: Configuration) -
     present in the metadata"""
     run_req = []
     for req in requires_dist:
-        list_raw_requirements = req.split(";")
-        selector = ""
-        if len(list_raw_requirements) > 1:
-            list_extra = get_extra_from_requires_dist(list_raw_requirements[1])
-            if skip_pypi_requirement(list_extra):
-                continue
+        parsed_req = parse_requires_dist(req)
+        if skip_pypi_requirement(parsed_req.extras):
+            continue
 
-            if result_selector := get_all_selectors_pypi(list_extra, config):
-                selector = " ".join(result_selector)
-                selector = f"  # [{selector}]"
-            else:
-                selector = ""
-        pkg_name, version = get_name_version_from_requires_dist(
-            list_raw_requirements[0]
-        )
-        run_req.append(f"{pkg_name} {version}{selector}".strip())
+        if result_selector := get_all_selectors_pypi(parsed_req.extras, config):
+            selector = " ".join(result_selector)
+            selector = f"  # [{selector}]"
+        else:
+            selector = ""
+        run_req.append(f"{parsed_req.name} {parsed_req.version}{selector}".strip())
     return run_req
 
 
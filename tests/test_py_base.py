@@ -2,13 +2,16 @@ from pathlib import Path
 
 from grayskull.config import Configuration
 from grayskull.main import create_python_recipe
+from grayskull.strategy import py_base
 from grayskull.strategy.py_base import (
     clean_deps_for_conda_forge,
     ensure_pep440,
     generic_py_ver_to,
     get_sdist_metadata,
+    get_sdist_metadata_batch,
     merge_deps_toml_setup,
     split_deps,
+    unpack_sdist,
     update_requirements_with_pin,
 )
 from grayskull.utils import PyVer
@@ -130,3 +133,175 @@ def test_split_deps():
 
 def test_split_deps_space():
     assert split_deps(">=1.8.0 <3.0.0 !=2.0.1") == [">=1.8.0", "<3.0.0", "!=2.0.1"]
+
+
+def test_select_sdist_members():
+    assert py_base._select_sdist_members(
+        [
+            "pkg-1.0/setup.cfg",
+            "pkg-1.0/src/mod.py",
+            "pkg-1.0/PKG-INFO",
+            "pkg-1.0/LICENSE",
+        ]
+    ) == ["pkg-1.0/setup.cfg", "pkg-1.0/PKG-INFO", "pkg-1.0/LICENSE"]
+    # a sdist shipping a setup.py must be fully extracted
+    assert (
+        py_base._select_sdist_members(["pkg-1.0/setup.py", "pkg-1.0/src/mod.py"])
+        is None
+    )
+
+
+def test_unpack_sdist_selective_extraction(tmp_path):
+    black_path = Path(__file__).parent / "data" / "pkgs" / "black-22.12.0.zip"
+    unpack_sdist(str(black_path), str(tmp_path))
+    assert (tmp_path / "black-22.12.0" / "pyproject.toml").is_file()
+    assert not (tmp_path / "black-22.12.0" / "src").exists()
+
+
+def test_unpack_sdist_full_extraction_with_setup_py(tmp_path):
+    windrose_path = Path(__file__).parent / "data" / "pkgs" / "windrose-1.8.1.tar"
+    unpack_sdist(str(windrose_path), str(tmp_path))
+    assert (tmp_path / "windrose-1.8.1" / "setup.py").is_file()
+    assert (tmp_path / "windrose-1.8.1" / "windrose" / "windrose.py").is_file()
+
+
+def test_get_sdist_metadata_batch():
+    pkgs_folder = Path(__file__).parent / "data" / "pkgs"
+    batch = [
+        (
+            "",
+            Configuration(
+                name="windrose",
+                version="1.8.1",
+                from_local_sdist=True,
+                local_sdist=str(pkgs_folder / "windrose-1.8.1.tar"),
+            ),
+        ),
+        (
+            "",
+            Configuration(
+                name="black",
+                version="22.12.0",
+                from_local_sdist=True,
+                local_sdist=str(pkgs_folder / "black-22.12.0.zip"),
+            ),
+        ),
+        (
+            "",
+            Configuration(
+                name="missing",
+                from_local_sdist=True,
+                local_sdist=str(pkgs_folder / "missing-1.0.0.tar.gz"),
+            ),
+        ),
+    ]
+    all_metadata = get_sdist_metadata_batch(batch)
+    assert [metadata.get("name") for metadata in all_metadata] == [
+        "windrose",
+        "black",
+        None,
+    ]
+    assert all_metadata[1]["license"] == "MIT"
+    # a failing package must not abort the batch, it yields an empty dict
+    assert all_metadata[2] == {}
+
+
+def test_get_setup_cfg_bare_percent(tmp_path):
+    (tmp_path / "setup.cfg").write_text(
+        "[metadata]\n"
+        "name = pkg\n"
+        "description = 100% pure python\n"
+        "\n"
+        "[options]\n"
+        "install_requires =\n"
+        "    requests\n"
+    )
+    setup_cfg = py_base.get_setup_cfg(str(tmp_path))
+    assert setup_cfg["name"] == "pkg"
+    assert setup_cfg["description"] == "100% pure python"
+    assert setup_cfg["install_requires"] == ["requests"]
+
+
+def test_get_build_requirements(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[build-system]\nrequires = ["setuptools>=42", "wheel"]\n'
+    )
+    (tmp_path / "setup.cfg").write_text("[options]\nsetup_requires =\n    cython\n")
+    assert py_base.get_build_requirements(str(tmp_path)) == [
+        "setuptools>=42",
+        "wheel",
+        "cython",
+    ]
+
+
+def test_get_build_requirements_broken_setup_cfg(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[build-system]\nrequires = ["setuptools"]\n'
+    )
+    (tmp_path / "setup.cfg").write_text("[options]\nzip_safe = 0\nzip_safe = 1\n")
+    assert py_base.get_build_requirements(str(tmp_path)) == ["setuptools"]
+
+
+def test_pip_install_deps_single_call(mocker):
+    check_output = mocker.patch("grayskull.strategy.py_base.check_output")
+    data_dist = {}
+    py_base.pip_install_deps(
+        data_dist, ["pkg_resources", "cython >=0.29", "=bogus="], "/tmp/pip-dir"
+    )
+    check_output.assert_called_once()
+    pip_cmd = check_output.call_args[0][0]
+    assert "setuptools" in pip_cmd
+    assert "cython >=0.29" in pip_cmd
+    # setuptools is never recorded and the malformed entry must not crash
+    assert data_dist["setup_requires"] == ["cython"]
+
+
+def test_persistent_metadata_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(py_base, "METADATA_CACHE_DIR", tmp_path / "metadata")
+    monkeypatch.setattr(py_base, "_get_remote_etag", lambda sdist_url: "etag-1")
+    config = Configuration(name="pkg")
+    url = "https://pypi.io/packages/source/p/pkg/pkg-1.0.tar.gz"
+    sdist_folder = tmp_path / "sdist"
+    (sdist_folder / "pkg-1.0").mkdir(parents=True)
+    (sdist_folder / "pkg-1.0" / "LICENSE").write_text("MIT License")
+    calls = []
+
+    @py_base.persistent_metadata_cache
+    def fake_get_metadata(sdist_url, config, with_source=False):
+        calls.append(sdist_url)
+        return {"name": "pkg", "sdist_path": str(sdist_folder)}
+
+    metadata = fake_get_metadata(url, config)
+    assert metadata["sdist_path"] == str(sdist_folder)
+    assert calls == [url]
+
+    # in-process hit: no new call and mutating the result must not poison it
+    metadata["name"] = "mutated"
+    assert fake_get_metadata(url, config)["name"] == "pkg"
+    assert calls == [url]
+
+    # a new decorated function simulates a new run sharing the disk cache:
+    # it must be served from disk, with sdist_path pointing at the license
+    # files persisted next to the entry instead of the original temp folder
+    @py_base.persistent_metadata_cache
+    def fake_get_metadata_second_run(sdist_url, config, with_source=False):
+        calls.append(sdist_url)
+        return {"name": "pkg"}
+
+    metadata = fake_get_metadata_second_run(url, config)
+    assert calls == [url]
+    assert metadata["name"] == "pkg"
+    cached_sdist_path = Path(metadata["sdist_path"])
+    assert cached_sdist_path != sdist_folder
+    assert (cached_sdist_path / "pkg-1.0" / "LICENSE").read_text() == "MIT License"
+
+    # a different ETag means a new package file and invalidates the entry
+    monkeypatch.setattr(py_base, "_get_remote_etag", lambda sdist_url: "etag-2")
+
+    @py_base.persistent_metadata_cache
+    def fake_get_metadata_third_run(sdist_url, config, with_source=False):
+        calls.append(sdist_url)
+        return {"name": "pkg"}
+
+    fake_get_metadata_third_run(url, config)
+    assert calls == [url, url]
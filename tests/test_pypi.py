@@ -26,6 +26,7 @@ from grayskull.strategy.py_base import (
     get_test_entry_points,
     get_test_imports,
     parse_extra_metadata_to_selector,
+    parse_requires_dist,
     py_version_to_limit_python,
     py_version_to_selector,
     update_requirements_with_pin,
@@ -41,7 +42,9 @@ from grayskull.strategy.pypi import (
     get_sha256_from_pypi_metadata,
     get_url_filename,
     merge_pypi_sdist_metadata,
+    metadata_from_pypi_json,
     normalize_requirements_list,
+    pypi_metadata_is_sufficient,
     remove_all_inner_nones,
     remove_selectors_pkgs_if_needed,
     sort_reqs,
@@ -174,6 +177,50 @@ def test_get_extra_from_requires_dist():
     ]
 
 
+def test_parse_requires_dist():
+    parsed = parse_requires_dist("py (>=1.5.0)")
+    assert parsed.name == "py"
+    assert parsed.version == ">=1.5.0"
+    assert parsed.extras == []
+
+    parsed = parse_requires_dist(
+        'typed-ast (>=1.4.2) ; python_version < "3.8" and extra == "d"'
+    )
+    assert parsed.name == "typed-ast"
+    assert parsed.version == ">=1.4.2"
+    assert parsed.extras == [
+        ("", "python_version", "<", "3.8", "", "and"),
+        ("", "extra", "==", "d", "", ""),
+    ]
+
+
+def test_pypi_metadata_is_sufficient():
+    assert pypi_metadata_is_sufficient(
+        {"requires_dist": ["requests"], "requires_python": ">=3.8"}
+    )
+    assert not pypi_metadata_is_sufficient(
+        {"requires_dist": None, "requires_python": ">=3.8"}
+    )
+    assert not pypi_metadata_is_sufficient({"requires_dist": ["requests"]})
+
+
+def test_metadata_from_pypi_json():
+    metadata = metadata_from_pypi_json(
+        {
+            "name": "pkg",
+            "version": "1.0.0",
+            "summary": "A package",
+            "requires_python": ">=3.8",
+            "requires_dist": ["requests >=2.24.0", 'pytest ; extra == "testing"'],
+        }
+    )
+    assert metadata["name"] == "pkg"
+    assert metadata["version"] == "1.0.0"
+    assert metadata["python_requires"] == ">=3.8"
+    assert metadata["install_requires"] == ["requests >=2.24.0"]
+    assert metadata["extras_require"] == {"testing": ["pytest"]}
+
+
 @pytest.fixture(scope="module")
 def dask_sdist_metadata():
     config = Configuration(name="dask")